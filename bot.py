@@ -1,20 +1,44 @@
 import os
-import subprocess
-import json
+import logging
+import orjson
 import asyncio
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
-from slack_bolt import App
-from slack_bolt.adapter.socket_mode import SocketModeHandler
-from datetime import datetime
+import functools
+from datetime import datetime, timedelta
 import requests
+from requests.adapters import HTTPAdapter
 import time
-import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-import schedule
 
-app = App(token=os.environ.get("SLACK_BOT_TOKEN"))
-client = WebClient(token=os.environ.get("SLACK_BOT_TOKEN"))
+from utils.process_utils import run_cmd
+from utils.report_utils import generate_allure_report
+
+@functools.lru_cache(maxsize=None)
+def _get_client():
+    from slack_sdk import WebClient
+    return WebClient(token=os.environ.get("SLACK_BOT_TOKEN"))
+
+@functools.lru_cache(maxsize=None)
+def _get_app():
+    from slack_bolt import App
+    app = App(token=os.environ.get("SLACK_BOT_TOKEN"))
+    app.command("/run-tests")(handle_run_tests)
+    app.command("/health-check")(handle_health_check)
+    app.command("/test-summary")(handle_test_summary)
+    return app
+
+@functools.lru_cache(maxsize=16)
+def _parse_results_cached(results_file, mtime):
+    data = orjson.loads(Path(results_file).read_bytes())
+    
+    summary = data.get('summary', {})
+    return {
+        "total": summary.get('total', 0),
+        "passed": summary.get('passed', 0),
+        "failed": summary.get('failed', 0),
+        "skipped": summary.get('skipped', 0),
+        "duration": data.get('duration', 0)
+    }
 
 class TestRunner:
     def __init__(self):
@@ -28,17 +52,14 @@ class TestRunner:
                 "tests/test_api.py", 
                 "--alluredir=reports/allure-results",
                 "--json-report", 
-                "--json-report-file=reports/test_results.json"
+                "--json-report-file=reports/test_results.json",
+                "-n", os.environ.get("PYTEST_XDIST_WORKERS", "auto"),
+                "--dist", "loadscope"
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = run_cmd(cmd, capture_output=True, text=True)
             
-            subprocess.run([
-                "allure", "generate", 
-                "reports/allure-results", 
-                "-o", "reports/allure-report", 
-                "--clean"
-            ])
+            generate_allure_report("reports/allure-results", "reports/allure-report")
             
             return self._parse_test_results("reports/test_results.json")
             
@@ -52,17 +73,14 @@ class TestRunner:
                 "tests/test_ui.py", 
                 "--alluredir=reports/allure-results-ui",
                 "--json-report", 
-                "--json-report-file=reports/ui_results.json"
+                "--json-report-file=reports/ui_results.json",
+                "-n", os.environ.get("PYTEST_XDIST_WORKERS", "auto"),
+                "--dist", "loadscope"
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = run_cmd(cmd, capture_output=True, text=True)
             
-            subprocess.run([
-                "allure", "generate", 
-                "reports/allure-results-ui", 
-                "-o", "reports/allure-report-ui", 
-                "--clean"
-            ])
+            generate_allure_report("reports/allure-results-ui", "reports/allure-report-ui")
             
             return self._parse_test_results("reports/ui_results.json")
             
@@ -71,17 +89,8 @@ class TestRunner:
     
     def _parse_test_results(self, results_file):
         try:
-            with open(results_file, 'r') as f:
-                data = json.load(f)
-            
-            summary = data.get('summary', {})
-            return {
-                "total": summary.get('total', 0),
-                "passed": summary.get('passed', 0),
-                "failed": summary.get('failed', 0),
-                "skipped": summary.get('skipped', 0),
-                "duration": data.get('duration', 0)
-            }
+            mtime = os.stat(results_file).st_mtime_ns
+            return dict(_parse_results_cached(results_file, mtime))
         except Exception:
             return {"error": "Failed to parse results", "passed": 0, "failed": 0, "total": 0}
 
@@ -89,29 +98,59 @@ class APIMonitor:
     def __init__(self, endpoints):
         self.endpoints = endpoints
         self.alert_channel = os.environ.get("ALERT_CHANNEL", "#qa-alerts")
+        self._pending = []
+        
+        pool_size = max(len(endpoints), 1)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
     
     def check_endpoints(self):
-        for endpoint in self.endpoints:
-            try:
-                start_time = time.time()
-                response = requests.get(endpoint['url'], timeout=10)
-                response_time = (time.time() - start_time) * 1000
-                
-                if response.status_code != endpoint.get('expected_status', 200):
-                    self._send_alert(endpoint['name'], endpoint['url'], 
-                                   f"Status: {response.status_code}")
-                
-                if response_time > endpoint.get('max_response_time', 5000):
-                    self._send_alert(endpoint['name'], endpoint['url'], 
-                                   f"Slow response: {response_time:.2f}ms")
-                
-            except requests.exceptions.RequestException as e:
-                self._send_alert(endpoint['name'], endpoint['url'], str(e))
-    
-    def _send_alert(self, name, url, error):
-        message = f"API Health Alert\nEndpoint: {name}\nURL: {url}\nIssue: {error}"
+        if not self.endpoints:
+            return
+        
+        with ThreadPoolExecutor(max_workers=len(self.endpoints)) as executor:
+            futures = [executor.submit(self._probe, endpoint) for endpoint in self.endpoints]
+            
+            for future in as_completed(futures):
+                name, url, issues = future.result()
+                for issue in issues:
+                    self._queue_alert(name, url, issue)
+        
+        self._flush_alerts()
+    
+    def _probe(self, endpoint):
+        issues = []
+        try:
+            start_time = time.time()
+            response = self.session.get(endpoint['url'], timeout=10)
+            response_time = (time.time() - start_time) * 1000
+            
+            if response.status_code != endpoint.get('expected_status', 200):
+                issues.append(f"Status: {response.status_code}")
+            
+            if response_time > endpoint.get('max_response_time', 5000):
+                issues.append(f"Slow response: {response_time:.2f}ms")
+            
+        except requests.exceptions.RequestException as e:
+            issues.append(str(e))
+        
+        return endpoint['name'], endpoint['url'], issues
+    
+    def _queue_alert(self, name, url, error):
+        self._pending.append(f"Endpoint: {name}\nURL: {url}\nIssue: {error}")
+    
+    def _flush_alerts(self):
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        
+        message = "API Health Alert\n" + "\n---\n".join(pending)
+        
+        from slack_sdk.errors import SlackApiError
         try:
-            client.chat_postMessage(channel=self.alert_channel, text=message)
+            _get_client().chat_postMessage(channel=self.alert_channel, text=message)
         except SlackApiError:
             pass
 
@@ -125,12 +164,21 @@ api_endpoints = [
 
 monitor = APIMonitor(api_endpoints)
 
-@app.command("/run-tests")
 def handle_run_tests(ack, say, command):
     ack()
-    
-    test_type = command['text'].strip().lower()
-    
+    _run_tests(say, command['text'].strip().lower())
+
+def _format_results(label, results, report_url):
+    return "\n".join((
+        f"{label} Test Results:",
+        f"Total: {results['total']}",
+        f"Passed: {results['passed']}",
+        f"Failed: {results['failed']}",
+        f"Duration: {results['duration']:.2f}s",
+        f"Report: {report_url}"
+    ))
+
+def _run_tests(say, test_type):
     if test_type == "api":
         say("Running API tests...")
         results = test_runner.run_api_tests()
@@ -138,13 +186,7 @@ def handle_run_tests(ack, say, command):
         if "error" in results:
             say(f"Test execution failed: {results['error']}")
         else:
-            message = f"API Test Results:\n"
-            message += f"Total: {results['total']}\n"
-            message += f"Passed: {results['passed']}\n"
-            message += f"Failed: {results['failed']}\n"
-            message += f"Duration: {results['duration']:.2f}s\n"
-            message += f"Report: http://localhost:8080/allure-report"
-            say(message)
+            say(_format_results("API", results, "http://localhost:8080/allure-report"))
     
     elif test_type == "ui":
         say("Running UI tests...")
@@ -153,74 +195,102 @@ def handle_run_tests(ack, say, command):
         if "error" in results:
             say(f"Test execution failed: {results['error']}")
         else:
-            message = f"UI Test Results:\n"
-            message += f"Total: {results['total']}\n"
-            message += f"Passed: {results['passed']}\n"
-            message += f"Failed: {results['failed']}\n"
-            message += f"Duration: {results['duration']:.2f}s\n"
-            message += f"Report: http://localhost:8080/allure-report-ui"
-            say(message)
+            say(_format_results("UI", results, "http://localhost:8080/allure-report-ui"))
     
     else:
         say("Usage: /run-tests [api|ui]")
 
-@app.command("/health-check")
 def handle_health_check(ack, say, command):
     ack()
+    _health_check(say)
+
+def _health_check(say):
     say("Checking API endpoints...")
     monitor.check_endpoints()
     say("Health check completed")
 
-@app.command("/test-summary")
 def handle_test_summary(ack, say, command):
     ack()
-    
-    api_results = test_runner.run_api_tests()
-    ui_results = test_runner.run_ui_tests()
-    
-    message = f"Test Summary Report - {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n"
-    message += f"API Tests: {api_results['passed']}/{api_results['total']} passed\n"
-    message += f"UI Tests: {ui_results['passed']}/{ui_results['total']} passed\n"
+    _test_summary(say)
+
+def _run_all_tests():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        api_future = executor.submit(test_runner.run_api_tests)
+        ui_future = executor.submit(test_runner.run_ui_tests)
+        return api_future.result(), ui_future.result()
+
+def _test_summary(say):
+    api_results, ui_results = _run_all_tests()
     
     total_passed = api_results['passed'] + ui_results['passed']
     total_tests = api_results['total'] + ui_results['total']
     
-    message += f"Overall: {total_passed}/{total_tests} tests passing"
+    message = "\n".join((
+        f"Test Summary Report - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+        "",
+        f"API Tests: {api_results['passed']}/{api_results['total']} passed",
+        f"UI Tests: {ui_results['passed']}/{ui_results['total']} passed",
+        f"Overall: {total_passed}/{total_tests} tests passing"
+    ))
     
     say(message)
 
-def daily_summary():
+async def daily_summary():
     channel = os.environ.get("DAILY_SUMMARY_CHANNEL", "#qa-daily")
     
-    api_results = test_runner.run_api_tests()
-    ui_results = test_runner.run_ui_tests()
+    loop = asyncio.get_running_loop()
+    api_results, ui_results = await loop.run_in_executor(None, _run_all_tests)
     
-    message = f"Daily Test Summary - {datetime.now().strftime('%Y-%m-%d')}\n"
-    message += f"API Tests: {api_results['passed']}/{api_results['total']}\n"
-    message += f"UI Tests: {ui_results['passed']}/{ui_results['total']}\n"
+    message = "\n".join((
+        f"Daily Test Summary - {datetime.now().strftime('%Y-%m-%d')}",
+        f"API Tests: {api_results['passed']}/{api_results['total']}",
+        f"UI Tests: {ui_results['passed']}/{ui_results['total']}"
+    ))
     
+    from slack_sdk.errors import SlackApiError
     try:
-        client.chat_postMessage(channel=channel, text=message)
+        _get_client().chat_postMessage(channel=channel, text=message)
     except SlackApiError:
         pass
 
-def scheduled_health_check():
-    monitor.check_endpoints()
+async def scheduled_health_check():
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, monitor.check_endpoints)
 
-def run_scheduler():
-    schedule.every().day.at("09:00").do(daily_summary)
-    schedule.every(15).minutes.do(scheduled_health_check)
-    
+async def _run_job(job):
+    try:
+        await job()
+    except Exception:
+        logging.exception("Scheduled job %s failed", job.__name__)
+
+async def _schedule_daily(hour, minute, job):
     while True:
-        schedule.run_pending()
-        time.sleep(60)
+        now = datetime.now()
+        next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        
+        await asyncio.sleep((next_run - now).total_seconds())
+        await _run_job(job)
+
+async def _schedule_every(interval, job):
+    while True:
+        await asyncio.sleep(interval.total_seconds())
+        await _run_job(job)
+
+async def run_scheduler():
+    await asyncio.gather(
+        asyncio.create_task(_schedule_daily(9, 0, daily_summary)),
+        asyncio.create_task(_schedule_every(timedelta(minutes=15), scheduled_health_check))
+    )
 
 def start_bot():
-    scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-    scheduler_thread.start()
+    from slack_bolt.adapter.socket_mode import SocketModeHandler
+    
+    handler = SocketModeHandler(_get_app(), os.environ["SLACK_APP_TOKEN"])
+    handler.connect()
     
-    handler = SocketModeHandler(app, os.environ["SLACK_APP_TOKEN"])
-    handler.start()
+    asyncio.run(run_scheduler())
 
 if __name__ == "__main__":
     start_bot()
\ No newline at end of file
@@ -1,15 +1,30 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-import subprocess
+import asyncio
+import functools
 import os
 from pathlib import Path
-import json
+import time
+import uuid
 from datetime import datetime
+import httpx
+import ijson
 import uvicorn
 
-app = FastAPI(title="QA Assistant API", version="1.0.0")
+from utils.process_utils import run_cmd_async
+from utils.report_utils import generate_allure_report_async
+
+app = FastAPI(title="QA Assistant API", version="1.0.0", default_response_class=ORJSONResponse)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+http_client = httpx.AsyncClient(follow_redirects=True)
+
+@app.on_event("shutdown")
+async def close_http_client():
+    await http_client.aclose()
 
 if Path("reports/allure-report").exists():
     app.mount("/allure-report", StaticFiles(directory="reports/allure-report"), name="allure-report")
@@ -29,69 +44,110 @@ class TestResult(BaseModel):
     duration: float
     report_url: str = None
 
+class TestJob(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+    report_url: str = None
+
 class HealthCheck(BaseModel):
     endpoint: str
     status: str
     response_time: float
     timestamp: datetime
 
-def run_tests_background(test_type: str, suite: str = None):
-    reports_dir = Path("reports")
-    reports_dir.mkdir(exist_ok=True)
-    
-    if test_type == "api":
-        if suite:
-            test_path = f"tests/test_{suite}.py"
-        else:
-            test_path = "tests/test_api.py"
+_run_locks = {"api": asyncio.Lock(), "ui": asyncio.Lock()}
+_active_jobs = {}
+
+async def run_tests_background(test_type: str, suite: str = None):
+    try:
+        reports_dir = Path("reports")
+        reports_dir.mkdir(exist_ok=True)
         
-        allure_dir = "reports/allure-results"
-        results_file = "reports/api_results.json"
-        report_dir = "reports/allure-report"
+        if test_type == "api":
+            if suite:
+                test_path = f"tests/test_{suite}.py"
+            else:
+                test_path = "tests/test_api.py"
+            
+            allure_dir = "reports/allure-results"
+            results_file = "reports/api_results.json"
+            report_dir = "reports/allure-report"
+            
+        elif test_type == "ui":
+            if suite:
+                test_path = f"tests/ui/test_{suite}.py"
+            else:
+                test_path = "tests/test_ui.py"
+            
+            allure_dir = "reports/allure-results-ui"
+            results_file = "reports/ui_results.json"
+            report_dir = "reports/allure-report-ui"
         
-    elif test_type == "ui":
-        if suite:
-            test_path = f"tests/ui/test_{suite}.py"
         else:
-            test_path = "tests/test_ui.py"
+            raise ValueError("Invalid test type")
         
-        allure_dir = "reports/allure-results-ui"
-        results_file = "reports/ui_results.json"
-        report_dir = "reports/allure-report-ui"
-    
-    else:
-        raise ValueError("Invalid test type")
-    
-    cmd = [
-        "pytest", test_path,
-        f"--alluredir={allure_dir}",
-        "--json-report",
-        f"--json-report-file={results_file}",
-        "-v"
-    ]
+        cmd = [
+            "pytest", test_path,
+            f"--alluredir={allure_dir}",
+            "--json-report",
+            f"--json-report-file={results_file}",
+            "-n", os.environ.get("PYTEST_XDIST_WORKERS", "auto"),
+            "--dist", "loadscope"
+        ]
+        
+        async with _run_locks[test_type]:
+            await run_cmd_async(
+                cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            
+            await generate_allure_report_async(
+                allure_dir,
+                report_dir,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+    finally:
+        _active_jobs.pop(test_type, None)
+
+_SUMMARY_FIELDS = ("total", "passed", "failed", "skipped")
+
+@functools.lru_cache(maxsize=16)
+def _parse_cached(results_file: str, mtime: int) -> dict:
+    results = {field: 0 for field in _SUMMARY_FIELDS}
+    results["duration"] = 0
+    seen_duration = seen_summary = False
     
-    subprocess.run(cmd, capture_output=True, text=True)
+    with open(results_file, 'rb', buffering=65536) as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix == "duration":
+                results["duration"] = value
+                seen_duration = True
+            elif prefix.startswith("summary."):
+                field = prefix[len("summary."):]
+                if field in _SUMMARY_FIELDS:
+                    results[field] = value
+            elif prefix == "summary" and event == "end_map":
+                seen_summary = True
+            
+            if seen_duration and seen_summary:
+                break
     
-    subprocess.run([
-        "allure", "generate",
-        allure_dir,
-        "-o", report_dir,
-        "--clean"
-    ])
+    return results
+
+@functools.lru_cache(maxsize=32)
+def _exists_cached(path: str, slot: int) -> bool:
+    return Path(path).exists()
+
+def path_exists(path: str) -> bool:
+    return _exists_cached(path, int(time.time()) // 2)
 
 def parse_test_results(results_file: str) -> dict:
     try:
-        with open(results_file, 'r') as f:
-            data = json.load(f)
-        
-        summary = data.get('summary', {})
-        return {
-            "total": summary.get('total', 0),
-            "passed": summary.get('passed', 0),
-            "failed": summary.get('failed', 0),
-            "skipped": summary.get('skipped', 0),
-            "duration": data.get('duration', 0)
-        }
+        mtime = os.stat(results_file).st_mtime_ns
+        return dict(_parse_cached(results_file, mtime))
     except Exception:
         return {"total": 0, "passed": 0, "failed": 0, "skipped": 0, "duration": 0}
 
@@ -103,36 +159,47 @@ async def root():
 async def health_check():
     return {"status": "healthy", "timestamp": datetime.now()}
 
-@app.post("/run-tests", response_model=TestResult)
+@app.post("/run-tests", response_model=TestJob, status_code=202)
 async def run_tests(request: TestRequest, background_tasks: BackgroundTasks):
-    try:
-        background_tasks.add_task(run_tests_background, request.test_type, request.suite)
-        
-        if request.test_type == "api":
-            results_file = "reports/api_results.json"
-            report_url = "/allure-report"
-        elif request.test_type == "ui":
-            results_file = "reports/ui_results.json"
-            report_url = "/allure-report-ui"
-        else:
-            raise HTTPException(status_code=400, detail="Invalid test type")
-        
-        results = parse_test_results(results_file)
-        results["report_url"] = report_url
-        
-        return TestResult(**results)
+    if request.test_type == "api":
+        report_url = "/allure-report"
+    elif request.test_type == "ui":
+        report_url = "/allure-report-ui"
+    else:
+        raise HTTPException(status_code=400, detail="Invalid test type")
+    
+    status_url = f"/test-results/{request.test_type}"
+    
+    if request.test_type in _active_jobs:
+        return TestJob(
+            job_id=_active_jobs[request.test_type],
+            status="already running",
+            status_url=status_url,
+            report_url=report_url
+        )
     
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    job_id = uuid.uuid4().hex
+    _active_jobs[request.test_type] = job_id
+    background_tasks.add_task(run_tests_background, request.test_type, request.suite)
+    
+    return TestJob(
+        job_id=job_id,
+        status="queued",
+        status_url=status_url,
+        report_url=report_url
+    )
 
 @app.get("/test-results/{test_type}")
 async def get_test_results(test_type: str):
     if test_type not in ["api", "ui"]:
         raise HTTPException(status_code=400, detail="Invalid test type")
     
+    if test_type in _active_jobs:
+        return {"status": "running", "job_id": _active_jobs[test_type]}
+    
     results_file = f"reports/{test_type}_results.json"
     
-    if not Path(results_file).exists():
+    if not path_exists(results_file):
         raise HTTPException(status_code=404, detail="Test results not found")
     
     results = parse_test_results(results_file)
@@ -148,7 +215,7 @@ async def get_report(test_type: str):
     else:
         report_path = "reports/allure-report-ui/index.html"
     
-    if not Path(report_path).exists():
+    if not path_exists(report_path):
         raise HTTPException(status_code=404, detail="Report not found")
     
     return FileResponse(report_path)
@@ -167,6 +234,29 @@ async def get_test_summary():
         "total_tests": api_results["total"] + ui_results["total"]
     }
 
+async def _probe_endpoint(client: httpx.AsyncClient, endpoint: dict) -> HealthCheck:
+    try:
+        start_time = time.time()
+        response = await client.get(endpoint["url"], timeout=10)
+        response_time = (time.time() - start_time) * 1000
+        
+        status = "healthy" if response.status_code == 200 else "unhealthy"
+        
+        return HealthCheck(
+            endpoint=endpoint["name"],
+            status=status,
+            response_time=response_time,
+            timestamp=datetime.now()
+        )
+    
+    except Exception:
+        return HealthCheck(
+            endpoint=endpoint["name"],
+            status="error",
+            response_time=0,
+            timestamp=datetime.now()
+        )
+
 @app.post("/health-check")
 async def perform_health_check():
     endpoints = [
@@ -175,35 +265,11 @@ async def perform_health_check():
         {"name": "Health Check", "url": "https://api.example.com/health"}
     ]
     
-    results = []
+    results = await asyncio.gather(
+        *(_probe_endpoint(http_client, endpoint) for endpoint in endpoints)
+    )
     
-    for endpoint in endpoints:
-        try:
-            import requests
-            import time
-            
-            start_time = time.time()
-            response = requests.get(endpoint["url"], timeout=10)
-            response_time = (time.time() - start_time) * 1000
-            
-            status = "healthy" if response.status_code == 200 else "unhealthy"
-            
-            results.append(HealthCheck(
-                endpoint=endpoint["name"],
-                status=status,
-                response_time=response_time,
-                timestamp=datetime.now()
-            ))
-        
-        except Exception:
-            results.append(HealthCheck(
-                endpoint=endpoint["name"],
-                status="error",
-                response_time=0,
-                timestamp=datetime.now()
-            ))
-    
-    return {"endpoints": results}
+    return {"endpoints": list(results)}
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
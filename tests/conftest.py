@@ -0,0 +1,6 @@
+import os
+
+def pytest_configure(config):
+    alluredir = config.getoption("allure_report_dir", default=None)
+    if alluredir:
+        os.environ.setdefault("ALLURE_DIR", alluredir)
@@ -0,0 +1,62 @@
+import base64
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from mitmproxy import http
+
+CACHE_DIR = Path(os.environ.get("UI_PROXY_CACHE_DIR", "reports/proxy-cache"))
+
+# Responses to credentialed requests are per-user and must never be replayed
+_CREDENTIAL_HEADERS = ("cookie", "authorization", "proxy-authorization")
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+class ResponseCache:
+    def __init__(self):
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    def _cache_path(self, flow: http.HTTPFlow) -> Path:
+        digest = hashlib.sha256()
+        digest.update(flow.request.method.encode())
+        digest.update(flow.request.pretty_url.encode())
+        digest.update(flow.request.raw_content or b"")
+        return CACHE_DIR / digest.hexdigest()
+
+    def _cacheable(self, flow: http.HTTPFlow) -> bool:
+        if flow.request.method != "GET":
+            return False
+        return not any(name in flow.request.headers for name in _CREDENTIAL_HEADERS)
+
+    def request(self, flow: http.HTTPFlow):
+        if not self._cacheable(flow):
+            return
+
+        try:
+            entry = json.loads(self._cache_path(flow).read_bytes())
+        except (FileNotFoundError, ValueError):
+            # Missing, or an entry written by an older cache format
+            return
+
+        headers = [(base64.b64decode(name), base64.b64decode(value)) for name, value in entry["headers"]]
+        flow.response = http.Response.make(entry["status_code"], base64.b64decode(entry["content"]), headers)
+
+    def response(self, flow: http.HTTPFlow):
+        if not self._cacheable(flow) or flow.response.status_code != 200:
+            return
+
+        if "set-cookie" in flow.response.headers:
+            return
+
+        path = self._cache_path(flow)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({
+            "status_code": flow.response.status_code,
+            "headers": [[_b64(name), _b64(value)] for name, value in flow.response.headers.fields],
+            "content": _b64(flow.response.content)
+        }))
+        os.replace(tmp_path, path)
+
+addons = [ResponseCache()]
@@ -1,38 +1,55 @@
 import pytest
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import allure
 from datetime import datetime
 
 BASE_URL = "https://api.example.com"
 
+@pytest.fixture(scope="session")
+def pooled_session():
+    s = requests.Session()
+    s.mount("https://", HTTPAdapter(pool_maxsize=50, max_retries=Retry(total=0)))
+    yield s
+    s.close()
+
+@pytest.fixture
+def session(pooled_session):
+    # Keep the connection pool but start every test with an empty cookie jar,
+    # so cookies set by login tests never leak into later tests
+    pooled_session.cookies.clear()
+    return pooled_session
+
 class TestAuthAPI:
     
     @allure.feature("Authentication")
     @allure.story("User Login")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_login_valid_credentials(self):
+    def test_login_valid_credentials(self, session):
         payload = {
             "username": "testuser",
             "password": "testpass123"
         }
         
-        response = requests.post(f"{BASE_URL}/auth/login", json=payload)
+        response = session.post(f"{BASE_URL}/auth/login", json=payload)
         
         assert response.status_code == 200
-        assert "access_token" in response.json()
-        assert "refresh_token" in response.json()
+        body = response.json()
+        assert "access_token" in body
+        assert "refresh_token" in body
     
     @allure.feature("Authentication")
     @allure.story("User Login")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_login_invalid_credentials(self):
+    def test_login_invalid_credentials(self, session):
         payload = {
             "username": "invalid",
             "password": "wrong"
         }
         
-        response = requests.post(f"{BASE_URL}/auth/login", json=payload)
+        response = session.post(f"{BASE_URL}/auth/login", json=payload)
         
         assert response.status_code == 401
         assert "error" in response.json()
@@ -40,17 +57,17 @@ class TestAuthAPI:
     @allure.feature("Authentication")
     @allure.story("Token Validation")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_token_validation(self):
+    def test_token_validation(self, session):
         login_payload = {
             "username": "testuser",
             "password": "testpass123"
         }
         
-        login_response = requests.post(f"{BASE_URL}/auth/login", json=login_payload)
+        login_response = session.post(f"{BASE_URL}/auth/login", json=login_payload)
         token = login_response.json()["access_token"]
         
         headers = {"Authorization": f"Bearer {token}"}
-        response = requests.get(f"{BASE_URL}/auth/validate", headers=headers)
+        response = session.get(f"{BASE_URL}/auth/validate", headers=headers)
         
         assert response.status_code == 200
         assert response.json()["valid"] is True
@@ -60,8 +77,8 @@ class TestUsersAPI:
     @allure.feature("User Management")
     @allure.story("Get Users")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_get_users_list(self):
-        response = requests.get(f"{BASE_URL}/users")
+    def test_get_users_list(self, session):
+        response = session.get(f"{BASE_URL}/users")
         
         assert response.status_code == 200
         assert isinstance(response.json(), list)
@@ -69,7 +86,7 @@ class TestUsersAPI:
     @allure.feature("User Management")
     @allure.story("Create User")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_create_user(self):
+    def test_create_user(self, session):
         payload = {
             "username": f"testuser_{datetime.now().timestamp()}",
             "email": "test@example.com",
@@ -77,7 +94,7 @@ class TestUsersAPI:
             "last_name": "User"
         }
         
-        response = requests.post(f"{BASE_URL}/users", json=payload)
+        response = session.post(f"{BASE_URL}/users", json=payload)
         
         assert response.status_code == 201
         assert response.json()["username"] == payload["username"]
@@ -85,14 +102,14 @@ class TestUsersAPI:
     @allure.feature("User Management")
     @allure.story("Update User")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_update_user(self):
+    def test_update_user(self, session):
         user_id = 1
         payload = {
             "first_name": "Updated",
             "last_name": "Name"
         }
         
-        response = requests.put(f"{BASE_URL}/users/{user_id}", json=payload)
+        response = session.put(f"{BASE_URL}/users/{user_id}", json=payload)
         
         assert response.status_code == 200
         assert response.json()["first_name"] == "Updated"
@@ -100,10 +117,10 @@ class TestUsersAPI:
     @allure.feature("User Management")
     @allure.story("Delete User")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_delete_user(self):
+    def test_delete_user(self, session):
         user_id = 999
         
-        response = requests.delete(f"{BASE_URL}/users/{user_id}")
+        response = session.delete(f"{BASE_URL}/users/{user_id}")
         
         assert response.status_code in [200, 204, 404]
 
@@ -112,11 +129,11 @@ class TestAPIPerformance:
     @allure.feature("Performance")
     @allure.story("Response Time")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_api_response_time(self):
+    def test_api_response_time(self, session):
         import time
         
         start_time = time.time()
-        response = requests.get(f"{BASE_URL}/health")
+        response = session.get(f"{BASE_URL}/health")
         end_time = time.time()
         
         response_time = (end_time - start_time) * 1000
@@ -127,11 +144,11 @@ class TestAPIPerformance:
     @allure.feature("Performance")
     @allure.story("Concurrent Requests")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_concurrent_requests(self):
+    def test_concurrent_requests(self, session):
         import concurrent.futures
         
         def make_request():
-            return requests.get(f"{BASE_URL}/health")
+            return session.get(f"{BASE_URL}/health")
         
         with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
             futures = [executor.submit(make_request) for _ in range(10)]
@@ -145,26 +162,26 @@ class TestAPISecurity:
     @allure.feature("Security")
     @allure.story("SQL Injection")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_sql_injection_protection(self):
+    def test_sql_injection_protection(self, session):
         malicious_payload = {
             "username": "admin'; DROP TABLE users; --",
             "password": "password"
         }
         
-        response = requests.post(f"{BASE_URL}/auth/login", json=malicious_payload)
+        response = session.post(f"{BASE_URL}/auth/login", json=malicious_payload)
         
         assert response.status_code in [400, 401, 422]
     
     @allure.feature("Security")
     @allure.story("XSS Protection")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_xss_protection(self):
+    def test_xss_protection(self, session):
         malicious_payload = {
             "username": "<script>alert('xss')</script>",
             "email": "test@example.com"
         }
         
-        response = requests.post(f"{BASE_URL}/users", json=malicious_payload)
+        response = session.post(f"{BASE_URL}/users", json=malicious_payload)
         
         if response.status_code == 201:
             user_data = response.json()
@@ -173,9 +190,9 @@ class TestAPISecurity:
     @allure.feature("Security")
     @allure.story("Rate Limiting")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_rate_limiting(self):
+    def test_rate_limiting(self, session):
         for _ in range(100):
-            response = requests.get(f"{BASE_URL}/health")
+            response = session.get(f"{BASE_URL}/health")
         
         assert response.status_code in [200, 429]
 
@@ -184,25 +201,25 @@ class TestDataValidation:
     @allure.feature("Data Validation")
     @allure.story("Required Fields")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_missing_required_fields(self):
+    def test_missing_required_fields(self, session):
         payload = {
             "email": "test@example.com"
         }
         
-        response = requests.post(f"{BASE_URL}/users", json=payload)
+        response = session.post(f"{BASE_URL}/users", json=payload)
         
         assert response.status_code in [400, 422]
     
     @allure.feature("Data Validation")
     @allure.story("Field Format Validation")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_invalid_email_format(self):
+    def test_invalid_email_format(self, session):
         payload = {
             "username": "testuser",
             "email": "invalid-email",
             "first_name": "Test"
         }
         
-        response = requests.post(f"{BASE_URL}/users", json=payload)
+        response = session.post(f"{BASE_URL}/users", json=payload)
         
         assert response.status_code in [400, 422]
\ No newline at end of file
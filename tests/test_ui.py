@@ -1,27 +1,229 @@
+import json
+import os
+import socket
+import subprocess
+from pathlib import Path
 import pytest
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException
-import allure
+from selenium.common.exceptions import TimeoutException, WebDriverException
 import time
 
+ALLURE_ENABLED = bool(os.environ.get("ALLURE_DIR"))
+
+if ALLURE_ENABLED:
+    import allure
+else:
+    class _NoAllure:
+        class severity_level:
+            BLOCKER = CRITICAL = NORMAL = MINOR = TRIVIAL = None
+        
+        feature = story = severity = staticmethod(lambda *_args, **_kwargs: (lambda f: f))
+    
+    allure = _NoAllure
+
 BASE_URL = "https://example.com"
 
+_LOC_LOGIN_BTN = (By.ID, "login-btn")
+_LOC_ERROR_MESSAGE = (By.CSS_SELECTOR, ".error-message")
+_LOC_USERNAME_ERROR = (By.ID, "username-error")
+_LOC_DASHBOARD = (By.CSS_SELECTOR, ".dashboard")
+_LOC_NAV_MENU = (By.CSS_SELECTOR, ".nav-menu")
+_LOC_MENU_LINKS = (By.TAG_NAME, "a")
+_LOC_PROFILE_BTN = (By.ID, "profile-btn")
+_LOC_PROFILE_MENU = (By.CSS_SELECTOR, ".profile-menu")
+_LOC_SUCCESS_MESSAGE = (By.CSS_SELECTOR, ".success-message")
+_LOC_EDIT_USER_BTN = (By.CLASS_NAME, "edit-user-btn")
+_LOC_FIRST_NAME = (By.ID, "first_name")
+_LOC_SAVE_BTN = (By.ID, "save-btn")
+_LOC_MOBILE_MENU_BTN = (By.CSS_SELECTOR, ".mobile-menu-btn")
+_LOC_NAVIGATION = (By.CSS_SELECTOR, ".navigation")
+_LOC_SUBMIT_BTN = (By.ID, "submit-btn")
+_LOC_NAME_ERROR = (By.ID, "name-error")
+_LOC_EMAIL_ERROR = (By.ID, "email-error")
+_LOC_MESSAGE_ERROR = (By.ID, "message-error")
+_LOC_EMAIL = (By.ID, "email")
+
+_WAIT_FOR_SELECTOR_JS = """
+new Promise((resolve) => {
+    const selector = %s;
+    if (document.querySelector(selector)) {
+        resolve(true);
+        return;
+    }
+    const observer = new MutationObserver(() => {
+        if (document.querySelector(selector)) {
+            observer.disconnect();
+            clearTimeout(timer);
+            resolve(true);
+        }
+    });
+    const timer = setTimeout(() => {
+        observer.disconnect();
+        resolve(false);
+    }, %d);
+    observer.observe(document, {childList: true, subtree: true});
+})
+"""
+
+def wait_for_selector(driver, locator, timeout=5):
+    by, value = locator
+    if by == By.ID:
+        by, value = By.CSS_SELECTOR, f"#{value}"
+    
+    if by != By.CSS_SELECTOR or not hasattr(driver, "execute_cdp_cmd"):
+        return WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((by, value))
+        )
+    
+    deadline = time.time() + timeout
+    
+    while True:
+        remaining_ms = max(int((deadline - time.time()) * 1000), 0)
+        try:
+            result = driver.execute_cdp_cmd("Runtime.evaluate", {
+                "expression": _WAIT_FOR_SELECTOR_JS % (json.dumps(value), remaining_ms),
+                "awaitPromise": True,
+                "returnByValue": True
+            })
+            if result.get("result", {}).get("value") is True:
+                return driver.find_element(By.CSS_SELECTOR, value)
+        except WebDriverException:
+            pass
+        
+        if time.time() >= deadline:
+            raise TimeoutException(f"Timed out waiting for {value}")
+        time.sleep(0.05)
+
 @pytest.fixture(scope="session")
-def driver():
+def proxy_cache():
+    cache_dir = os.environ.get("UI_PROXY_CACHE_DIR")
+    if not cache_dir:
+        yield None
+        return
+    
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    
+    proc = subprocess.Popen(
+        [
+            "mitmdump", "-q",
+            "--listen-host", "127.0.0.1",
+            "-p", str(port),
+            "-s", str(Path(__file__).with_name("proxy_cache_addon.py"))
+        ],
+        env={**os.environ, "UI_PROXY_CACHE_DIR": cache_dir}
+    )
+    
+    deadline = time.time() + 10
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            break
+        except OSError:
+            if proc.poll() is not None or time.time() > deadline:
+                proc.kill()
+                raise RuntimeError("mitmdump proxy failed to start")
+            time.sleep(0.1)
+    
+    yield f"127.0.0.1:{port}"
+    
+    proc.terminate()
+    proc.wait(timeout=10)
+
+_CHROME_ARGS = (
+    "--headless",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--mute-audio",
+    "--blink-settings=imagesEnabled=false",
+    "--window-size=1920,1080"
+)
+
+def _chrome_options():
     options = webdriver.ChromeOptions()
-    options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
+    for arg in _CHROME_ARGS:
+        options.add_argument(arg)
+    
+    binary_path = os.environ.get("CHROME_BINARY_PATH")
+    if binary_path:
+        options.binary_location = binary_path
+    
+    options.page_load_strategy = "eager"
+    return options
+
+@pytest.fixture(scope="session")
+def driver(proxy_cache):
+    options = _chrome_options()
+    remote_url = os.environ.get("SELENIUM_REMOTE_URL")
     
-    driver = webdriver.Chrome(options=options)
-    driver.implicitly_wait(10)
+    if remote_url:
+        driver = webdriver.Remote(command_executor=remote_url, options=options)
+    else:
+        if proxy_cache:
+            options.add_argument(f"--proxy-server=http://{proxy_cache}")
+            options.add_argument("--ignore-certificate-errors")
+        
+        driver = webdriver.Chrome(options=options)
     yield driver
     driver.quit()
 
+# Sets each value through the native setter so framework-controlled inputs
+# (e.g. React) see the change, then fires the events send_keys would have
+_FILL_JS = """
+for (const [id, value] of Object.entries(arguments[0])) {
+    const field = document.getElementById(id);
+    const setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(field), 'value').set;
+    setter.call(field, value);
+    field.dispatchEvent(new Event('input', {bubbles: true}));
+    field.dispatchEvent(new Event('change', {bubbles: true}));
+    field.dispatchEvent(new FocusEvent('blur'));
+    field.dispatchEvent(new FocusEvent('focusout', {bubbles: true}));
+}
+"""
+
+def fill_and_submit(driver, fields, submit_id):
+    submit = WebDriverWait(driver, 10).until(
+        EC.element_to_be_clickable((By.ID, submit_id))
+    )
+    driver.execute_script(_FILL_JS, fields)
+    submit.click()
+
+def _login(driver, username, password):
+    driver.get(f"{BASE_URL}/login")
+    
+    fill_and_submit(driver, {"username": username, "password": password}, "login-btn")
+    
+    WebDriverWait(driver, 10).until(
+        EC.url_contains("/dashboard")
+    )
+
+@pytest.fixture(scope="class")
+def logged_in_driver(driver):
+    _login(driver, "testuser", "testpass123")
+    yield driver
+    driver.delete_all_cookies()
+
+@pytest.fixture(scope="class")
+def admin_driver(driver):
+    _login(driver, "admin", "adminpass123")
+    yield driver
+    driver.delete_all_cookies()
+
+@pytest.fixture(scope="class")
+def home_driver(driver):
+    driver.get(BASE_URL)
+    yield driver
+    driver.set_window_size(1920, 1080)
+
 class TestLoginPage:
     
     @allure.feature("Authentication")
@@ -30,13 +232,7 @@ class TestLoginPage:
     def test_successful_login(self, driver):
         driver.get(f"{BASE_URL}/login")
         
-        username_field = driver.find_element(By.ID, "username")
-        password_field = driver.find_element(By.ID, "password")
-        login_button = driver.find_element(By.ID, "login-btn")
-        
-        username_field.send_keys("testuser")
-        password_field.send_keys("testpass123")
-        login_button.click()
+        fill_and_submit(driver, {"username": "testuser", "password": "testpass123"}, "login-btn")
         
         WebDriverWait(driver, 10).until(
             EC.url_contains("/dashboard")
@@ -50,20 +246,9 @@ class TestLoginPage:
     def test_login_with_invalid_credentials(self, driver):
         driver.get(f"{BASE_URL}/login")
         
-        username_field = driver.find_element(By.ID, "username")
-        password_field = driver.find_element(By.ID, "password")
-        login_button = driver.find_element(By.ID, "login-btn")
-        
-        username_field.clear()
-        password_field.clear()
-        
-        username_field.send_keys("invalid")
-        password_field.send_keys("wrong")
-        login_button.click()
+        fill_and_submit(driver, {"username": "invalid", "password": "wrong"}, "login-btn")
         
-        error_message = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "error-message"))
-        )
+        error_message = wait_for_selector(driver, _LOC_ERROR_MESSAGE, 10)
         
         assert error_message.is_displayed()
         assert "Invalid credentials" in error_message.text.lower()
@@ -74,12 +259,10 @@ class TestLoginPage:
     def test_empty_login_fields(self, driver):
         driver.get(f"{BASE_URL}/login")
         
-        login_button = driver.find_element(By.ID, "login-btn")
+        login_button = wait_for_selector(driver, _LOC_LOGIN_BTN)
         login_button.click()
         
-        username_error = WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.ID, "username-error"))
-        )
+        username_error = wait_for_selector(driver, _LOC_USERNAME_ERROR, 5)
         
         assert username_error.is_displayed()
 
@@ -88,27 +271,17 @@ class TestDashboardPage:
     @allure.feature("Dashboard")
     @allure.story("Page Load")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_dashboard_loads_after_login(self, driver):
-        self._login(driver)
-        
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "dashboard"))
-        )
-        
-        dashboard = driver.find_element(By.CLASS_NAME, "dashboard")
+    def test_dashboard_loads_after_login(self, logged_in_driver):
+        dashboard = wait_for_selector(logged_in_driver, _LOC_DASHBOARD, 10)
         assert dashboard.is_displayed()
     
     @allure.feature("Dashboard")
     @allure.story("Navigation")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_navigation_menu(self, driver):
-        self._login(driver)
-        
-        nav_menu = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "nav-menu"))
-        )
+    def test_navigation_menu(self, logged_in_driver):
+        nav_menu = wait_for_selector(logged_in_driver, _LOC_NAV_MENU, 10)
         
-        menu_items = nav_menu.find_elements(By.TAG_NAME, "a")
+        menu_items = nav_menu.find_elements(*_LOC_MENU_LINKS)
         assert len(menu_items) > 0
         
         for item in menu_items:
@@ -117,140 +290,76 @@ class TestDashboardPage:
     @allure.feature("Dashboard")
     @allure.story("User Profile")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_user_profile_access(self, driver):
-        self._login(driver)
-        
-        profile_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.ID, "profile-btn"))
+    def test_user_profile_access(self, logged_in_driver):
+        profile_button = WebDriverWait(logged_in_driver, 10).until(
+            EC.element_to_be_clickable(_LOC_PROFILE_BTN)
         )
         profile_button.click()
         
-        profile_menu = WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "profile-menu"))
-        )
+        profile_menu = wait_for_selector(logged_in_driver, _LOC_PROFILE_MENU, 5)
         
         assert profile_menu.is_displayed()
-    
-    def _login(self, driver):
-        driver.get(f"{BASE_URL}/login")
-        
-        username_field = driver.find_element(By.ID, "username")
-        password_field = driver.find_element(By.ID, "password")
-        login_button = driver.find_element(By.ID, "login-btn")
-        
-        username_field.send_keys("testuser")
-        password_field.send_keys("testpass123")
-        login_button.click()
-        
-        WebDriverWait(driver, 10).until(
-            EC.url_contains("/dashboard")
-        )
 
 class TestUserManagement:
     
     @allure.feature("User Management")
     @allure.story("Create User")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_create_new_user(self, driver):
-        self._login_as_admin(driver)
-        
-        driver.get(f"{BASE_URL}/users/new")
-        
-        first_name = driver.find_element(By.ID, "first_name")
-        last_name = driver.find_element(By.ID, "last_name")
-        email = driver.find_element(By.ID, "email")
-        username = driver.find_element(By.ID, "username")
-        submit_btn = driver.find_element(By.ID, "submit-btn")
+    def test_create_new_user(self, admin_driver):
+        admin_driver.get(f"{BASE_URL}/users/new")
         
-        timestamp = str(int(time.time()))
+        timestamp = f"{int(time.time() * 1000)}-{os.environ.get('PYTEST_XDIST_WORKER', '0')}"
         
-        first_name.send_keys("Test")
-        last_name.send_keys("User")
-        email.send_keys(f"testuser{timestamp}@example.com")
-        username.send_keys(f"testuser{timestamp}")
-        submit_btn.click()
+        fill_and_submit(admin_driver, {
+            "first_name": "Test",
+            "last_name": "User",
+            "email": f"testuser{timestamp}@example.com",
+            "username": f"testuser{timestamp}"
+        }, "submit-btn")
         
-        success_message = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "success-message"))
-        )
+        success_message = wait_for_selector(admin_driver, _LOC_SUCCESS_MESSAGE, 10)
         
         assert success_message.is_displayed()
     
     @allure.feature("User Management")
     @allure.story("Edit User")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_edit_user(self, driver):
-        self._login_as_admin(driver)
-        
-        driver.get(f"{BASE_URL}/users")
+    def test_edit_user(self, admin_driver):
+        admin_driver.get(f"{BASE_URL}/users")
         
-        first_user_edit = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CLASS_NAME, "edit-user-btn"))
+        first_user_edit = WebDriverWait(admin_driver, 10).until(
+            EC.element_to_be_clickable(_LOC_EDIT_USER_BTN)
         )
         first_user_edit.click()
         
-        first_name = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "first_name"))
-        )
+        first_name = wait_for_selector(admin_driver, _LOC_FIRST_NAME, 10)
         
         first_name.clear()
         first_name.send_keys("Updated Name")
         
-        save_btn = driver.find_element(By.ID, "save-btn")
+        save_btn = wait_for_selector(admin_driver, _LOC_SAVE_BTN)
         save_btn.click()
         
-        success_message = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "success-message"))
-        )
+        success_message = wait_for_selector(admin_driver, _LOC_SUCCESS_MESSAGE, 10)
         
         assert success_message.is_displayed()
-    
-    def _login_as_admin(self, driver):
-        driver.get(f"{BASE_URL}/login")
-        
-        username_field = driver.find_element(By.ID, "username")
-        password_field = driver.find_element(By.ID, "password")
-        login_button = driver.find_element(By.ID, "login-btn")
-        
-        username_field.send_keys("admin")
-        password_field.send_keys("adminpass123")
-        login_button.click()
-        
-        WebDriverWait(driver, 10).until(
-            EC.url_contains("/dashboard")
-        )
 
 class TestResponsiveDesign:
     
     @allure.feature("Responsive Design")
-    @allure.story("Mobile View")
-    @allure.severity(allure.severity_level.NORMAL)
-    def test_mobile_responsive(self, driver):
-        driver.set_window_size(375, 667)
-        driver.get(f"{BASE_URL}")
-        
-        mobile_menu = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "mobile-menu-btn"))
-        )
-        
-        assert mobile_menu.is_displayed()
-        
-        driver.set_window_size(1920, 1080)
-    
-    @allure.feature("Responsive Design")
-    @allure.story("Tablet View")
+    @allure.story("Viewport Sizes")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_tablet_responsive(self, driver):
-        driver.set_window_size(768, 1024)
-        driver.get(f"{BASE_URL}")
-        
-        navigation = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "navigation"))
-        )
+    @pytest.mark.parametrize("width,height,locator", [
+        (375, 667, _LOC_MOBILE_MENU_BTN),
+        (768, 1024, _LOC_NAVIGATION),
+        (1920, 1080, _LOC_NAVIGATION)
+    ], ids=["mobile", "tablet", "desktop"])
+    def test_responsive_layout(self, home_driver, width, height, locator):
+        home_driver.set_window_size(width, height)
         
-        assert navigation.is_displayed()
+        element = wait_for_selector(home_driver, locator, 10)
         
-        driver.set_window_size(1920, 1080)
+        assert element.is_displayed()
 
 class TestFormValidation:
     
@@ -260,14 +369,12 @@ class TestFormValidation:
     def test_contact_form_validation(self, driver):
         driver.get(f"{BASE_URL}/contact")
         
-        submit_btn = driver.find_element(By.ID, "submit-btn")
+        submit_btn = wait_for_selector(driver, _LOC_SUBMIT_BTN)
         submit_btn.click()
         
-        name_error = WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.ID, "name-error"))
-        )
-        email_error = driver.find_element(By.ID, "email-error")
-        message_error = driver.find_element(By.ID, "message-error")
+        name_error = wait_for_selector(driver, _LOC_NAME_ERROR, 5)
+        email_error = wait_for_selector(driver, _LOC_EMAIL_ERROR)
+        message_error = wait_for_selector(driver, _LOC_MESSAGE_ERROR)
         
         assert name_error.is_displayed()
         assert email_error.is_displayed()
@@ -279,15 +386,13 @@ class TestFormValidation:
     def test_invalid_email_format(self, driver):
         driver.get(f"{BASE_URL}/contact")
         
-        email_field = driver.find_element(By.ID, "email")
+        email_field = wait_for_selector(driver, _LOC_EMAIL)
         email_field.send_keys("invalid-email")
         
-        submit_btn = driver.find_element(By.ID, "submit-btn")
+        submit_btn = wait_for_selector(driver, _LOC_SUBMIT_BTN)
         submit_btn.click()
         
-        email_error = WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.ID, "email-error"))
-        )
+        email_error = wait_for_selector(driver, _LOC_EMAIL_ERROR, 5)
         
         assert email_error.is_displayed()
         assert "valid email" in email_error.text.lower()
\ No newline at end of file
@@ -2,11 +2,16 @@ import requests
 import time
 import json
 import asyncio
+import random
 import aiohttp
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 import logging
+from collections import deque
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from urllib3.exceptions import ReadTimeoutError
 
 @dataclass
 class EndpointConfig:
@@ -34,75 +39,173 @@ class HealthCheckResult:
 class APIMonitor:
     def __init__(self, endpoints: List[EndpointConfig]):
         self.endpoints = endpoints
-        self.results_history = []
         self.max_history = 1000
+        self.results_history = deque(maxlen=self.max_history)
         self.logger = logging.getLogger(__name__)
+        self._session = None
+        
+        # One pooled session per (retry_count, retry_delay) policy. requests picks
+        # adapters by URL prefix, so mounting per endpoint URL would leak one
+        # endpoint's policy onto another whose URL merely starts with it.
+        self._http_sessions = {}
+        for endpoint in endpoints:
+            self._session_for(endpoint)
+    
+    def _session_for(self, endpoint: EndpointConfig) -> requests.Session:
+        key = (endpoint.retry_count, endpoint.retry_delay)
+        session = self._http_sessions.get(key)
+        
+        if session is None:
+            adapter = HTTPAdapter(
+                pool_connections=50,
+                pool_maxsize=50,
+                max_retries=Retry(
+                    total=max(endpoint.retry_count - 1, 0),
+                    backoff_factor=endpoint.retry_delay,
+                    status_forcelist=[502, 503, 504],
+                    allowed_methods=None,
+                    raise_on_status=False
+                )
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session = self._http_sessions.setdefault(key, session)
+        
+        return session
     
     def check_endpoint_sync(self, endpoint: EndpointConfig) -> HealthCheckResult:
         start_time = time.time()
         
+        try:
+            response = self._session_for(endpoint).request(
+                endpoint.method.upper(),
+                endpoint.url,
+                headers=endpoint.headers,
+                json=endpoint.payload if endpoint.method.upper() == "POST" else None,
+                timeout=endpoint.timeout
+            )
+            
+            response_time = (time.time() - start_time) * 1000
+            
+            if response.status_code == endpoint.expected_status:
+                if response_time <= endpoint.max_response_time * 1000:
+                    status = "healthy"
+                    error_message = None
+                else:
+                    status = "slow"
+                    error_message = f"Response time {response_time:.2f}ms exceeds threshold {endpoint.max_response_time * 1000}ms"
+            else:
+                status = "unhealthy"
+                error_message = f"Expected status {endpoint.expected_status}, got {response.status_code}"
+            
+            status_code = response.status_code
+            
+        except requests.exceptions.Timeout:
+            status, status_code = "error", None
+            error_message = f"Request timeout after {endpoint.timeout}s"
+            
+        except requests.exceptions.ConnectionError as e:
+            status, status_code = "error", None
+            # Exhausted urllib3 retries wrap read timeouts in MaxRetryError -> ConnectionError
+            reason = getattr(e.args[0], "reason", None) if e.args else None
+            if isinstance(reason, ReadTimeoutError):
+                error_message = f"Request timeout after {endpoint.timeout}s"
+            else:
+                error_message = "Connection error"
+            
+        except Exception as e:
+            status, status_code = "error", None
+            error_message = str(e)
+        
+        result = HealthCheckResult(
+            endpoint_name=endpoint.name,
+            url=endpoint.url,
+            status=status,
+            status_code=status_code,
+            response_time=(time.time() - start_time) * 1000,
+            timestamp=datetime.now(),
+            error_message=error_message
+        )
+        
+        self._add_to_history(result)
+        return result
+    
+    async def __aenter__(self):
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=60)
+        )
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._session.close()
+        self._session = None
+    
+    async def check_all(self) -> List[HealthCheckResult]:
+        if self._session is None:
+            async with self:
+                return await self.check_all()
+        
+        return await asyncio.gather(
+            *(self.check_endpoint_async(endpoint) for endpoint in self.endpoints)
+        )
+    
+    async def check_endpoint_async(self, endpoint: EndpointConfig) -> HealthCheckResult:
+        if self._session is not None:
+            return await self._check_endpoint_with_session(self._session, endpoint)
+        
+        async with aiohttp.ClientSession() as session:
+            return await self._check_endpoint_with_session(session, endpoint)
+    
+    async def _check_endpoint_with_session(self, session: aiohttp.ClientSession, endpoint: EndpointConfig) -> HealthCheckResult:
+        start_time = time.time()
+        
         for attempt in range(endpoint.retry_count):
             try:
-                if endpoint.method.upper() == "GET":
-                    response = requests.get(
+                async with asyncio.timeout(endpoint.timeout):
+                    async with session.request(
+                        endpoint.method.upper(),
                         endpoint.url,
                         headers=endpoint.headers,
-                        timeout=endpoint.timeout
-                    )
-                elif endpoint.method.upper() == "POST":
-                    response = requests.post(
-                        endpoint.url,
-                        headers=endpoint.headers,
-                        json=endpoint.payload,
-                        timeout=endpoint.timeout
-                    )
-                
-                response_time = (time.time() - start_time) * 1000
-                
-                if response.status_code == endpoint.expected_status:
-                    if response_time <= endpoint.max_response_time * 1000:
-                        status = "healthy"
-                        error_message = None
-                    else:
-                        status = "slow"
-                        error_message = f"Response time {response_time:.2f}ms exceeds threshold {endpoint.max_response_time * 1000}ms"
-                else:
-                    status = "unhealthy"
-                    error_message = f"Expected status {endpoint.expected_status}, got {response.status_code}"
-                
-                result = HealthCheckResult(
-                    endpoint_name=endpoint.name,
-                    url=endpoint.url,
-                    status=status,
-                    status_code=response.status_code,
-                    response_time=response_time,
-                    timestamp=datetime.now(),
-                    error_message=error_message
-                )
-                
-                self._add_to_history(result)
-                return result
-                
-            except requests.exceptions.Timeout:
-                if attempt < endpoint.retry_count - 1:
-                    time.sleep(endpoint.retry_delay)
-                    continue
+                        json=endpoint.payload if endpoint.method.upper() == "POST" else None
+                    ) as response:
+                        response_time = (time.time() - start_time) * 1000
+                        
+                        if response.status == endpoint.expected_status:
+                            if response_time <= endpoint.max_response_time * 1000:
+                                status = "healthy"
+                                error_message = None
+                            else:
+                                status = "slow"
+                                error_message = f"Response time {response_time:.2f}ms exceeds threshold {endpoint.max_response_time * 1000}ms"
+                        else:
+                            status = "unhealthy"
+                            error_message = f"Expected status {endpoint.expected_status}, got {response.status}"
+                        
+                        result = HealthCheckResult(
+                            endpoint_name=endpoint.name,
+                            url=endpoint.url,
+                            status=status,
+                            status_code=response.status,
+                            response_time=response_time,
+                            timestamp=datetime.now(),
+                            error_message=error_message
+                        )
+                        
+                        self._add_to_history(result)
+                        return result
                 
+            except TimeoutError:
                 error_message = f"Request timeout after {endpoint.timeout}s"
                 
-            except requests.exceptions.ConnectionError:
-                if attempt < endpoint.retry_count - 1:
-                    time.sleep(endpoint.retry_delay)
-                    continue
-                
+            except aiohttp.ClientConnectionError:
                 error_message = "Connection error"
                 
             except Exception as e:
-                if attempt < endpoint.retry_count - 1:
-                    time.sleep(endpoint.retry_delay)
-                    continue
-                
                 error_message = str(e)
+            
+            if attempt < endpoint.retry_count - 1:
+                await asyncio.sleep(self._backoff_delay(endpoint, attempt))
         
         response_time = (time.time() - start_time) * 1000
         result = HealthCheckResult(
@@ -118,44 +221,11 @@ class APIMonitor:
         self._add_to_history(result)
         return result
     
-    async def check_endpoint_async(self, endpoint: EndpointConfig) -> HealthCheckResult:
-        start_time = time.time()
-        
-        async with aiohttp.ClientSession() as session:
-            for attempt in range(endpoint.retry_count):
-                try:
-                    if endpoint.method.upper() == "GET":
-                        async with session.get(
-                            endpoint.url,
-                            headers=endpoint.headers,
-                            timeout=aiohttp.ClientTimeout(total=endpoint.timeout)
-                        ) as response:
-                            response_time = (time.time() - start_time) * 1000
-                            
-                            if response.status == endpoint.expected_status:
-                                if response_time <= endpoint.max_response_time * 1000:
-                                    status = "healthy"
-                                    error_message = None
-                                else:
-                                    status = "slow"
-                                    error_message = f"Response time {response_time:.2f}ms exceeds threshold {endpoint.max_response_time * 1000}ms"
-                            else:
-                                status = "unhealthy"
-                                error_message = f"Expected status {endpoint.expected_status}, got {response.status}"
-                            
-                            result = HealthCheckResult(
-                                endpoint_name=endpoint.name,
-                                url=endpoint.url,
-                                status=status,
-                                status_code=response.status,
-                                response_time=response_time,
-                                timestamp=datetime.now(),
-                                error_message=error_message
-                            )
-                            
-                            self._add_to_history(result)
-                            return result
-                    
-                    elif endpoint.method.upper() == "POST":
-                        async with session.post(
-                            endpoint.url,
\ No newline at end of file
+    @staticmethod
+    def _backoff_delay(endpoint: EndpointConfig, attempt: int) -> float:
+        # Truncated exponential backoff with jitter so failing endpoints don't retry in lockstep
+        delay = min(endpoint.retry_delay * (2 ** attempt), endpoint.timeout)
+        return delay * random.uniform(0.5, 1.5)
+    
+    def _add_to_history(self, result: HealthCheckResult):
+        self.results_history.append(result)
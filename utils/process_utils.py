@@ -0,0 +1,26 @@
+import asyncio
+import shutil
+import subprocess
+from typing import List
+
+# CPython only takes the posix_spawn() fast path when the executable is an
+# absolute path and close_fds/pass_fds/start_new_session are left unset;
+# otherwise it falls back to fork+exec. Descriptors opened by Python are
+# non-inheritable by default, so leaving close_fds off does not leak them.
+
+def _resolve(cmd: List[str]) -> List[str]:
+    executable = shutil.which(cmd[0]) or cmd[0]
+    return [executable, *cmd[1:]]
+
+def run_cmd(cmd: List[str], **kwargs) -> subprocess.CompletedProcess:
+    return subprocess.run(_resolve(cmd), close_fds=False, **kwargs)
+
+def spawn_cmd(cmd: List[str], **kwargs) -> subprocess.Popen:
+    return subprocess.Popen(_resolve(cmd), close_fds=False, **kwargs)
+
+async def spawn_cmd_async(cmd: List[str], **kwargs) -> asyncio.subprocess.Process:
+    return await asyncio.create_subprocess_exec(*_resolve(cmd), close_fds=False, **kwargs)
+
+async def run_cmd_async(cmd: List[str], **kwargs) -> int:
+    proc = await spawn_cmd_async(cmd, **kwargs)
+    return await proc.wait()
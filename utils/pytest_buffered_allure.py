@@ -0,0 +1,74 @@
+import json
+import os
+import uuid
+
+import pytest
+import allure_pytest.plugin
+from allure_commons.logger import AllureFileLogger
+from attr import asdict
+
+try:
+    from orjson import dumps as _dumps
+except ImportError:
+    def _dumps(data):
+        return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+_FLUSH_THRESHOLD = 256
+
+_loggers = []
+
+class BufferedAllureFileLogger(AllureFileLogger):
+    def __init__(self, report_dir, clean=False):
+        super().__init__(report_dir, clean)
+        self._pending = []
+        _loggers.append(self)
+    
+    def _report_item(self, item):
+        filename = item.file_pattern.format(prefix=uuid.uuid4())
+        data = asdict(
+            item,
+            filter=lambda attr, value: not (
+                type(value) != bool and not bool(value)
+            )
+        )
+        
+        if os.environ.get("ALLURE_INDENT_OUTPUT"):
+            body = json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+        else:
+            body = _dumps(data)
+        
+        self._pending.append((self._report_dir / filename, body))
+        
+        if len(self._pending) >= _FLUSH_THRESHOLD:
+            self.flush()
+    
+    def flush(self):
+        pending, self._pending = self._pending, []
+        
+        for path, body in pending:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, body)
+            finally:
+                os.close(fd)
+
+def _flush_all():
+    for logger in _loggers:
+        logger.flush()
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # Runs before allure-pytest's own pytest_configure, which then builds this logger
+    allure_pytest.plugin.AllureFileLogger = BufferedAllureFileLogger
+    config.add_cleanup(_flush_all)
+
+# Flush per test and at session end so a run killed mid-way keeps what it finished.
+# The wrapper sits outside allure-pytest's, which closes the test result after its yield.
+@pytest.hookimpl(hookwrapper=True, tryfirst=True)
+def pytest_runtest_logfinish(nodeid, location):
+    yield
+    _flush_all()
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session, exitstatus):
+    _flush_all()
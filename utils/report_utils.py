@@ -0,0 +1,37 @@
+import os
+from typing import List, Optional
+
+from utils.process_utils import run_cmd, run_cmd_async
+
+# allure-results directory -> newest entry mtime at the last successful generate,
+# so an unchanged results directory does not rebuild the same report.
+_generated_mtimes = {}
+
+def latest_mtime(directory: str) -> Optional[int]:
+    try:
+        with os.scandir(directory) as entries:
+            return max((entry.stat().st_mtime_ns for entry in entries), default=None)
+    except FileNotFoundError:
+        return None
+
+def _is_current(allure_dir: str, results_mtime: Optional[int]) -> bool:
+    return results_mtime is not None and _generated_mtimes.get(allure_dir) == results_mtime
+
+def _generate_cmd(allure_dir: str, report_dir: str) -> List[str]:
+    return ["allure", "generate", allure_dir, "-o", report_dir, "--clean"]
+
+def generate_allure_report(allure_dir: str, report_dir: str, **kwargs) -> None:
+    results_mtime = latest_mtime(allure_dir)
+    if _is_current(allure_dir, results_mtime):
+        return
+
+    if run_cmd(_generate_cmd(allure_dir, report_dir), **kwargs).returncode == 0:
+        _generated_mtimes[allure_dir] = results_mtime
+
+async def generate_allure_report_async(allure_dir: str, report_dir: str, **kwargs) -> None:
+    results_mtime = latest_mtime(allure_dir)
+    if _is_current(allure_dir, results_mtime):
+        return
+
+    if await run_cmd_async(_generate_cmd(allure_dir, report_dir), **kwargs) == 0:
+        _generated_mtimes[allure_dir] = results_mtime
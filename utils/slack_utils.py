@@ -1,8 +1,31 @@
 import os
+import orjson
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
-from datetime import datetime
+from slack_sdk.web import base_client
+from datetime import date, datetime
 import json
+import time
+from functools import lru_cache
+
+# slack_sdk's base client only uses json.dumps to build request bodies; orjson
+# returns UTF-8 bytes, which it sends as-is. Everything else falls through to json.
+class _OrjsonBodySerializer:
+    dumps = staticmethod(orjson.dumps)
+    
+    def __getattr__(self, name):
+        return getattr(json, name)
+
+base_client.json = _OrjsonBodySerializer()
+
+def _header_block(text):
+    return {"type": "header", "text": {"type": "plain_text", "text": text}}
+
+def _fields_block(*texts):
+    return {"type": "section", "fields": [{"type": "mrkdwn", "text": text} for text in texts]}
+
+# Static blocks are built once and shared; the payload is only serialized, never mutated.
+_HEALTH_ALERT_HEADER = _header_block("⚠️ API Health Alert")
 
 class SlackNotifier:
     def __init__(self):
@@ -26,34 +49,13 @@ class SlackNotifier:
         status_emoji = "✅" if results["failed"] == 0 else "❌"
         
         blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"{status_emoji} {test_type.upper()} Test Results"
-                }
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Total:* {results['total']}"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Passed:* {results['passed']}"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Failed:* {results['failed']}"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Duration:* {results['duration']:.2f}s"
-                    }
-                ]
-            }
+            _header_block(f"{status_emoji} {test_type.upper()} Test Results"),
+            _fields_block(
+                f"*Total:* {results['total']}",
+                f"*Passed:* {results['passed']}",
+                f"*Failed:* {results['failed']}",
+                f"*Duration:* {results['duration']:.2f}s"
+            )
         ]
         
         if results.get("report_url"):
@@ -67,36 +69,34 @@ class SlackNotifier:
         
         return self.send_message(channel, f"{test_type.upper()} test results", blocks=blocks)
     
+    def send_test_summary_from_results(self, channel, test_type, raw_results):
+        total = raw_results.get("total", 0)
+        passed = raw_results.get("passed", 0)
+        failed = raw_results.get("failed", 0)
+        success_rate = (passed / total * 100) if total > 0 else 0
+        status_emoji = "✅" if failed == 0 else "❌"
+        
+        blocks = [
+            _header_block(f"{status_emoji} {test_type.upper()} Test Summary"),
+            _fields_block(
+                f"*Passed:* {passed}/{total}",
+                f"*Failed:* {failed}",
+                f"*Skipped:* {raw_results.get('skipped', 0)}",
+                f"*Success Rate:* {success_rate:.1f}%"
+            )
+        ]
+        
+        return self.send_message(channel, f"{test_type.upper()} test summary", blocks=blocks)
+    
     def send_health_alert(self, channel, endpoint_name, url, error):
         blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": "⚠️ API Health Alert"
-                }
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Endpoint:* {endpoint_name}"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*URL:* {url}"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Issue:* {error}"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Time:* {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-                    }
-                ]
-            }
+            _HEALTH_ALERT_HEADER,
+            _fields_block(
+                f"*Endpoint:* {endpoint_name}",
+                f"*URL:* {url}",
+                f"*Issue:* {error}",
+                f"*Time:* {datetime.now().isoformat(sep=' ', timespec='seconds')}"
+            )
         ]
         
         return self.send_message(channel, "API Health Alert", blocks=blocks)
@@ -109,34 +109,13 @@ class SlackNotifier:
         status_emoji = "✅" if success_rate >= 90 else "⚠️" if success_rate >= 70 else "❌"
         
         blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"{status_emoji} Daily Test Summary - {datetime.now().strftime('%Y-%m-%d')}"
-                }
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*API Tests:* {api_results['passed']}/{api_results['total']}"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*UI Tests:* {ui_results['passed']}/{ui_results['total']}"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Success Rate:* {success_rate:.1f}%"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Total Duration:* {api_results['duration'] + ui_results['duration']:.1f}s"
-                    }
-                ]
-            }
+            _header_block(f"{status_emoji} Daily Test Summary - {date.today().isoformat()}"),
+            _fields_block(
+                f"*API Tests:* {api_results['passed']}/{api_results['total']}",
+                f"*UI Tests:* {ui_results['passed']}/{ui_results['total']}",
+                f"*Success Rate:* {success_rate:.1f}%",
+                f"*Total Duration:* {api_results['duration'] + ui_results['duration']:.1f}s"
+            )
         ]
         
         return self.send_message(channel, "Daily Test Summary", blocks=blocks)
@@ -144,51 +123,44 @@ class SlackNotifier:
     def send_deployment_notification(self, channel, environment, status, version=None):
         emoji = "🚀" if status == "success" else "❌"
         
+        fields = [f"*Environment:* {environment}", f"*Status:* {status.title()}"]
+        if version:
+            fields.append(f"*Version:* {version}")
+        
         blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"{emoji} Deployment {status.title()}"
-                }
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Environment:* {environment}"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Status:* {status.title()}"
-                    }
-                ]
-            }
+            _header_block(f"{emoji} Deployment {status.title()}"),
+            _fields_block(*fields)
         ]
         
-        if version:
-            blocks[1]["fields"].append({
-                "type": "mrkdwn",
-                "text": f"*Version:* {version}"
-            })
-        
         return self.send_message(channel, f"Deployment {status}", blocks=blocks)
     
     def get_user_info(self, user_id):
         try:
-            response = self.client.users_info(user=user_id)
-            return response["user"]
+            return _cached_user_info(self.client, user_id, _ttl_slot())
         except SlackApiError:
             return None
     
     def get_channel_info(self, channel_id):
         try:
-            response = self.client.conversations_info(channel=channel_id)
-            return response["channel"]
+            return _cached_channel_info(self.client, channel_id, _ttl_slot())
         except SlackApiError:
             return None
 
+# Lookups are keyed by a 5-minute time slot so stale metadata ages out; errors
+# propagate out of the cached helpers and are therefore never cached.
+_INFO_TTL = 300
+
+def _ttl_slot():
+    return int(time.time() // _INFO_TTL)
+
+@lru_cache(maxsize=256)
+def _cached_user_info(client, user_id, slot):
+    return client.users_info(user=user_id)["user"]
+
+@lru_cache(maxsize=256)
+def _cached_channel_info(client, channel_id, slot):
+    return client.conversations_info(channel=channel_id)["channel"]
+
 def format_test_summary(results):
     summary = {
         "timestamp": datetime.now().isoformat(),
@@ -200,10 +172,15 @@ def format_test_summary(results):
     }
     return summary
 
+_BAR_WIDTH = 40
+_FULL = "█" * _BAR_WIDTH
+_EMPTY = "░" * _BAR_WIDTH
+
 def create_progress_bar(passed, total, width=20):
+    full, empty = (_FULL, _EMPTY) if width <= _BAR_WIDTH else ("█" * width, "░" * width)
+    
     if total == 0:
-        return "█" * width
+        return full[:width]
     
     progress = int((passed / total) * width)
-    bar = "█" * progress + "░" * (width - progress)
-    return f"{bar} {passed}/{total}"
\ No newline at end of file
+    return f"{full[:progress]}{empty[:width - progress]} {passed}/{total}"
\ No newline at end of file
@@ -1,81 +1,193 @@
+import asyncio
 import subprocess
 import json
 import os
+import re
+import shutil
 import threading
 import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import logging
 
+from utils.process_utils import run_cmd, spawn_cmd, spawn_cmd_async
+
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+_REPORT_FIELDS = ("created", "duration")
+_SUMMARY_PREFIX_SIZE = 65536
+_SUMMARY_RE = re.compile(rb'"summary":\s*(\{[^{}]*\})')
+_REPORT_FIELD_RES = {
+    field: re.compile(rb'"%s":\s*(-?[0-9][0-9.eE+-]*)' % field.encode()) for field in _REPORT_FIELDS
+}
+
+_PARSE_CACHE_SIZE = 64
+
+# The "-p utils.pytest_buffered_allure" plugin must import from any working directory
+_PACKAGE_ROOT = str(Path(__file__).resolve().parents[1])
+
+@lru_cache(maxsize=64)
+def _marker_args(markers: Tuple[str, ...]) -> Tuple[str, ...]:
+    return tuple(arg for marker in markers for arg in ("-m", marker))
+
 class TestRunner:
     def __init__(self, reports_dir: str = "reports"):
         self.reports_dir = Path(reports_dir)
         self.reports_dir.mkdir(exist_ok=True)
         self.logger = logging.getLogger(__name__)
-        self.running_tests = set()
+        self.running_tests: Dict[str, float] = {}
+        self._state_lock = threading.Lock()
+        self._parse_cache = OrderedDict()
+        self._dirs_created = set()
+        self._pending_allure: List[str] = []
+        self._base_env = {**os.environ, "PYTHONPATH": os.pathsep.join((_PACKAGE_ROOT, str(Path.cwd())))}
+        self._results_listing: Optional[tuple] = None
     
-    def run_pytest_tests(self, test_path: str, test_type: str, markers: List[str] = None, parallel: bool = False) -> Dict:
-        if test_type in self.running_tests:
-            return {"error": f"{test_type} tests are already running", "status": "running"}
-        
-        self.running_tests.add(test_type)
+    def run_pytest_tests(self, test_path: str, test_type: str, markers: List[str] = None, parallel: bool = False, batch: bool = False, extra_env: Optional[Dict[str, str]] = None) -> Dict:
+        with self._state_lock:
+            if test_type in self.running_tests:
+                return {"error": f"{test_type} tests are already running", "status": "running"}
+            
+            self.running_tests[test_type] = time.time()
         
         try:
-            allure_dir = f"reports/allure-results-{test_type}"
-            results_file = f"reports/{test_type}_results.json"
-            report_dir = f"reports/allure-report-{test_type}"
+            cmd, env, allure_dir, results_file, report_dir = self._prepare_pytest_run(test_path, test_type, markers, parallel, extra_env)
             
-            Path(allure_dir).mkdir(exist_ok=True)
-            Path(report_dir).mkdir(exist_ok=True)
+            proc = spawn_cmd(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=env,
+                bufsize=1,
+                text=True,
+                encoding="utf-8",
+                errors="replace"
+            )
             
-            cmd = [
-                "pytest", test_path,
-                f"--alluredir={allure_dir}",
-                "--json-report",
-                f"--json-report-file={results_file}",
-                "-v",
-                "--tb=short"
+            pumps = [
+                threading.Thread(target=self._log_stream, args=(proc.stdout, self.logger.info), daemon=True),
+                threading.Thread(target=self._log_stream, args=(proc.stderr, self.logger.error), daemon=True)
             ]
+            for pump in pumps:
+                pump.start()
+            
+            try:
+                returncode = proc.wait(timeout=1800)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+                raise
+            finally:
+                for pump in pumps:
+                    pump.join()
             
-            if markers:
-                for marker in markers:
-                    cmd.extend(["-m", marker])
+            self.logger.info("Test execution completed with return code: %s", returncode)
             
-            if parallel:
-                import multiprocessing
-                cpu_count = multiprocessing.cpu_count()
-                cmd.extend(["-n", str(min(cpu_count, 4))])
+            return self._finish_pytest_run(test_type, allure_dir, report_dir, results_file, batch)
             
-            env = os.environ.copy()
-            env["PYTHONPATH"] = str(Path.cwd())
+        except subprocess.TimeoutExpired:
+            return {"error": "Test execution timed out", "status": "timeout"}
+        except Exception as e:
+            self.logger.error("Error running tests: %s", e)
+            return {"error": str(e), "status": "error"}
+        finally:
+            with self._state_lock:
+                self.running_tests.pop(test_type, None)
+    
+    def _prepare_pytest_run(self, test_path: str, test_type: str, markers: Optional[List[str]], parallel: bool, extra_env: Optional[Dict[str, str]]):
+        allure_dir = f"reports/allure-results-{test_type}"
+        results_file = f"reports/{test_type}_results.json"
+        report_dir = f"reports/allure-report-{test_type}"
+        
+        self._ensure_dir(allure_dir)
+        self._ensure_dir(report_dir)
+        
+        cmd = [
+            "pytest", test_path,
+            f"--alluredir={allure_dir}",
+            "-p", "utils.pytest_buffered_allure",
+            "--json-report",
+            f"--json-report-file={results_file}",
+            "-v",
+            "--tb=short"
+        ]
+        
+        cmd.extend(_marker_args(tuple(markers or ())))
+        
+        if parallel:
+            cmd.extend(["-n", os.environ.get("PYTEST_XDIST_WORKERS", "auto"), "--dist=loadfile"])
+        
+        env = {**self._base_env, **extra_env} if extra_env else self._base_env
+        
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Running command: %s", " ".join(cmd))
+        
+        return cmd, env, allure_dir, results_file, report_dir
+    
+    def _finish_pytest_run(self, test_type: str, allure_dir: str, report_dir: str, results_file: str, batch: bool) -> Dict:
+        if batch:
+            with self._state_lock:
+                if allure_dir not in self._pending_allure:
+                    self._pending_allure.append(allure_dir)
+        else:
+            self._generate_allure_report([allure_dir], report_dir)
+        
+        return self._parse_test_results(results_file, test_type)
+    
+    async def run_pytest_tests_async(self, test_path: str, test_type: str, markers: List[str] = None, parallel: bool = False, batch: bool = False, extra_env: Optional[Dict[str, str]] = None) -> Dict:
+        with self._state_lock:
+            if test_type in self.running_tests:
+                return {"error": f"{test_type} tests are already running", "status": "running"}
             
-            self.logger.info(f"Running command: {' '.join(cmd)}")
+            self.running_tests[test_type] = time.time()
+        
+        try:
+            cmd, env, allure_dir, results_file, report_dir = self._prepare_pytest_run(test_path, test_type, markers, parallel, extra_env)
             
-            result = subprocess.run(
+            proc = await spawn_cmd_async(
                 cmd,
-                capture_output=True,
-                text=True,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
                 env=env,
-                timeout=1800
+                limit=1024 * 1024
             )
             
-            self.logger.info(f"Test execution completed with return code: {result.returncode}")
-            self.logger.info(f"STDOUT: {result.stdout}")
-            if result.stderr:
-                self.logger.error(f"STDERR: {result.stderr}")
+            try:
+                async with asyncio.timeout(1800):
+                    _, _, returncode = await asyncio.gather(
+                        self._log_stream_async(proc.stdout, self.logger.info),
+                        self._log_stream_async(proc.stderr, self.logger.error),
+                        proc.wait()
+                    )
+            finally:
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
             
-            self._generate_allure_report(allure_dir, report_dir)
+            self.logger.info("Test execution completed with return code: %s", returncode)
             
-            return self._parse_test_results(results_file, test_type)
+            return await asyncio.to_thread(self._finish_pytest_run, test_type, allure_dir, report_dir, results_file, batch)
             
-        except subprocess.TimeoutExpired:
+        except TimeoutError:
             return {"error": "Test execution timed out", "status": "timeout"}
         except Exception as e:
-            self.logger.error(f"Error running tests: {str(e)}")
+            self.logger.error("Error running tests: %s", e)
             return {"error": str(e), "status": "error"}
         finally:
-            self.running_tests.discard(test_type)
+            with self._state_lock:
+                self.running_tests.pop(test_type, None)
     
     def run_api_tests(self, suite: str = None, markers: List[str] = None) -> Dict:
         if suite:
@@ -91,10 +203,9 @@ class TestRunner:
         else:
             test_path = "tests/test_ui.py"
         
-        if headless:
-            os.environ["HEADLESS"] = "true"
+        extra_env = {"HEADLESS": "true"} if headless else None
         
-        return self.run_pytest_tests(test_path, "ui", markers)
+        return self.run_pytest_tests(test_path, "ui", markers, extra_env=extra_env)
     
     def run_security_tests(self, suite: str = None) -> Dict:
         if suite:
@@ -118,14 +229,18 @@ class TestRunner:
     def run_regression_tests(self) -> Dict:
         return self.run_pytest_tests("tests/", "regression", ["regression"])
     
+    async def run_smoke_tests_async(self) -> Dict:
+        return await self.run_pytest_tests_async("tests/", "smoke", ["smoke"])
+    
     def run_custom_command(self, command: List[str], test_type: str) -> Dict:
-        if test_type in self.running_tests:
-            return {"error": f"{test_type} tests are already running", "status": "running"}
-        
-        self.running_tests.add(test_type)
+        with self._state_lock:
+            if test_type in self.running_tests:
+                return {"error": f"{test_type} tests are already running", "status": "running"}
+            
+            self.running_tests[test_type] = time.time()
         
         try:
-            result = subprocess.run(
+            result = run_cmd(
                 command,
                 capture_output=True,
                 text=True,
@@ -145,7 +260,8 @@ class TestRunner:
         except Exception as e:
             return {"error": str(e), "status": "error"}
         finally:
-            self.running_tests.discard(test_type)
+            with self._state_lock:
+                self.running_tests.pop(test_type, None)
     
     def run_newman_collection(self, collection_path: str, environment: str = None) -> Dict:
         if not Path(collection_path).exists():
@@ -158,89 +274,212 @@ class TestRunner:
         
         return self.run_custom_command(cmd, "newman")
     
-    def _generate_allure_report(self, allure_dir: str, report_dir: str):
+    def _ensure_dir(self, path: str):
+        if path in self._dirs_created:
+            return
+        
+        Path(path).mkdir(parents=True, exist_ok=True)
+        self._dirs_created.add(path)
+    
+    @staticmethod
+    def _log_stream(stream, log):
+        with stream:
+            for line in stream:
+                log(line.rstrip())
+    
+    @staticmethod
+    async def _log_stream_async(stream, log):
+        async for line in stream:
+            log(line.decode(errors="replace").rstrip())
+    
+    def flush_allure_reports(self, report_dir: str = "reports/allure-report-combined"):
+        with self._state_lock:
+            allure_dirs, self._pending_allure = self._pending_allure, []
+        
+        if allure_dirs:
+            self._generate_allure_report(allure_dirs, report_dir)
+    
+    def _generate_allure_report(self, allure_dirs: List[str], report_dir: str):
         try:
             cmd = [
                 "allure", "generate",
-                allure_dir,
+                *allure_dirs,
                 "-o", report_dir,
                 "--clean"
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = run_cmd(cmd, capture_output=True, text=True)
             
             if result.returncode != 0:
-                self.logger.error(f"Failed to generate Allure report: {result.stderr}")
+                self.logger.error("Failed to generate Allure report: %s", result.stderr)
             else:
-                self.logger.info(f"Allure report generated successfully in {report_dir}")
+                self.logger.info("Allure report generated successfully in %s", report_dir)
                 
         except Exception as e:
-            self.logger.error(f"Error generating Allure report: {str(e)}")
+            self.logger.error("Error generating Allure report: %s", e)
     
     def _parse_test_results(self, results_file: str, test_type: str) -> Dict:
         try:
-            if not Path(results_file).exists():
-                return {
-                    "error": "Results file not found",
-                    "status": "error",
-                    "test_type": test_type
-                }
-            
-            with open(results_file, 'r') as f:
-                data = json.load(f)
-            
-            summary = data.get('summary', {})
-            
+            return self._load_test_results(results_file, test_type)
+        except FileNotFoundError:
             return {
-                "test_type": test_type,
-                "total": summary.get('total', 0),
-                "passed": summary.get('passed', 0),
-                "failed": summary.get('failed', 0),
-                "skipped": summary.get('skipped', 0),
-                "error": summary.get('error', 0),
-                "duration": data.get('duration', 0),
-                "start_time": data.get('created', datetime.now().isoformat()),
-                "status": "completed",
-                "report_url": f"/allure-report-{test_type}",
-                "success_rate": (summary.get('passed', 0) / summary.get('total', 1)) * 100
-            }
-            
-        except Exception as e:
-            self.logger.error(f"Error parsing test results: {str(e)}")
-            return {
-                "error": f"Failed to parse results: {str(e)}",
+                "error": "Results file not found",
                 "status": "error",
                 "test_type": test_type
             }
+        except Exception as e:
+            return self._parse_error(e, test_type)
+    
+    def _load_test_results(self, results_file: str, test_type: str) -> Dict:
+        with open(results_file, 'rb') as f:
+            st = os.fstat(f.fileno())
+            key = (results_file, st.st_mtime_ns, st.st_size)
+            
+            # generate_summary_report parses suites on worker threads
+            with self._state_lock:
+                cached = self._parse_cache.get(key)
+                if cached is not None:
+                    self._parse_cache.move_to_end(key)
+                    return dict(cached)
+            
+            data = self._read_summary_only(f.read(_SUMMARY_PREFIX_SIZE))
+            if data is None:
+                f.seek(0)
+                data = self._stream_report_fields(f) if ijson else _loads(f.read())
+        
+        summary = data.get('summary', {})
+        total = summary.get('total', 0)
+        passed = summary.get('passed', 0)
+        
+        results = {
+            "test_type": test_type,
+            "total": total,
+            "passed": passed,
+            "failed": summary.get('failed', 0),
+            "skipped": summary.get('skipped', 0),
+            "error": summary.get('error', 0),
+            "duration": data.get('duration', 0),
+            "start_time": data.get('created', datetime.now().isoformat()),
+            "status": "completed",
+            "report_url": f"/allure-report-{test_type}",
+            "success_rate": (passed * 100.0 / total) if total else 0.0
+        }
+        
+        with self._state_lock:
+            self._parse_cache[key] = results
+            if len(self._parse_cache) > _PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+        
+        return dict(results)
+    
+    @staticmethod
+    def _read_summary_only(prefix: bytes) -> Optional[Dict]:
+        summary_match = _SUMMARY_RE.search(prefix)
+        if not summary_match:
+            return None
+        
+        data = {}
+        for field, pattern in _REPORT_FIELD_RES.items():
+            match = pattern.search(prefix, 0, summary_match.start())
+            if not match:
+                return None
+            data[field] = _loads(match.group(1))
+        
+        try:
+            data["summary"] = _loads(summary_match.group(1))
+        except ValueError:
+            return None
+        
+        return data
+    
+    @staticmethod
+    def _stream_report_fields(f) -> Dict:
+        # pytest-json-report writes created/duration/summary ahead of the per-test
+        # entries, so stop as soon as they have been read.
+        data = {"summary": {}}
+        seen_summary = False
+        
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix in _REPORT_FIELDS:
+                data[prefix] = value
+            elif prefix.startswith("summary.") and event not in ("start_map", "end_map", "map_key"):
+                data["summary"][prefix[len("summary."):]] = value
+            elif prefix == "summary" and event == "end_map":
+                seen_summary = True
+            
+            if seen_summary and all(field in data for field in _REPORT_FIELDS):
+                break
+        
+        return data
+    
+    def _parse_error(self, e: Exception, test_type: str) -> Dict:
+        self.logger.error("Error parsing test results: %s", e)
+        return {
+            "error": f"Failed to parse results: {str(e)}",
+            "status": "error",
+            "test_type": test_type
+        }
     
     def get_test_status(self, test_type: str) -> Dict:
-        if test_type in self.running_tests:
-            return {"status": "running", "test_type": test_type}
+        with self._state_lock:
+            started_at = self.running_tests.get(test_type)
         
-        results_file = f"reports/{test_type}_results.json"
+        if started_at is not None:
+            return {"status": "running", "test_type": test_type, "started_at": started_at}
         
-        if Path(results_file).exists():
-            return self._parse_test_results(results_file, test_type)
+        results_file = f"reports/{test_type}_results.json"
         
-        return {"status": "not_run", "test_type": test_type}
+        try:
+            return self._load_test_results(results_file, test_type)
+        except FileNotFoundError:
+            return {"status": "not_run", "test_type": test_type}
+        except Exception as e:
+            return self._parse_error(e, test_type)
     
     def stop_running_tests(self, test_type: str = None):
-        if test_type:
-            self.running_tests.discard(test_type)
-        else:
-            self.running_tests.clear()
+        with self._state_lock:
+            if test_type:
+                self.running_tests.pop(test_type, None)
+            else:
+                self.running_tests.clear()
     
     def cleanup_old_reports(self, days: int = 7):
         cutoff_time = time.time() - (days * 24 * 60 * 60)
         
-        for report_dir in self.reports_dir.iterdir():
-            if report_dir.is_dir() and report_dir.stat().st_mtime < cutoff_time:
-                try:
-                    import shutil
-                    shutil.rmtree(report_dir)
-                    self.logger.info(f"Cleaned up old report directory: {report_dir}")
-                except Exception as e:
-                    self.logger.error(f"Failed to clean up {report_dir}: {str(e)}")
+        with os.scandir(self.reports_dir) as entries:
+            stale_dirs = [
+                entry.path for entry in entries
+                if entry.is_dir(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_mtime < cutoff_time
+            ]
+        
+        if stale_dirs:
+            with ThreadPoolExecutor(max_workers=min(4, len(stale_dirs))) as executor:
+                list(executor.map(self._remove_report_dir, stale_dirs))
+    
+    def _remove_report_dir(self, path: str):
+        try:
+            try:
+                removed = run_cmd(["rm", "-rf", path]).returncode == 0
+            except FileNotFoundError:
+                removed = False
+            
+            if not removed:
+                shutil.rmtree(path)
+            
+            self.logger.info("Cleaned up old report directory: %s", path)
+        except Exception as e:
+            self.logger.error("Failed to clean up %s: %s", path, e)
+    
+    def _list_results_files(self) -> List[Path]:
+        mtime = self.reports_dir.stat().st_mtime_ns
+        if self._results_listing and self._results_listing[0] == mtime:
+            return self._results_listing[1]
+        
+        with os.scandir(self.reports_dir) as entries:
+            results_files = [Path(entry.path) for entry in entries if entry.name.endswith("_results.json")]
+        
+        self._results_listing = (mtime, results_files)
+        return results_files
     
     def generate_summary_report(self) -> Dict:
         summary = {
@@ -255,10 +494,13 @@ class TestRunner:
             }
         }
         
-        for results_file in self.reports_dir.glob("*_results.json"):
-            test_type = results_file.stem.replace("_results", "")
-            results = self._parse_test_results(str(results_file), test_type)
-            
+        results_files = self._list_results_files()
+        test_types = [results_file.stem.replace("_results", "") for results_file in results_files]
+        
+        with ThreadPoolExecutor(max_workers=max(min(8, os.cpu_count() or 1, len(results_files)), 1)) as executor:
+            parsed = list(executor.map(self._parse_test_results, map(str, results_files), test_types))
+        
+        for test_type, results in zip(test_types, parsed):
             if results.get("status") == "completed":
                 summary["test_suites"][test_type] = results
                 summary["overall"]["total"] += results.get("total", 0)
@@ -274,6 +516,8 @@ class TestRunner:
         else:
             summary["overall"]["success_rate"] = 0
         
+        self.flush_allure_reports()
+        
         return summary
 
 class ContinuousTestRunner:
@@ -281,7 +525,7 @@ class ContinuousTestRunner:
         self.test_runner = test_runner
         self.interval = interval
         self.running = False
-        self.thread = None
+        self.task = None
         self.logger = logging.getLogger(__name__)
     
     def start(self):
@@ -289,27 +533,26 @@ class ContinuousTestRunner:
             return
         
         self.running = True
-        self.thread = threading.Thread(target=self._run_continuous_tests)
-        self.thread.daemon = True
-        self.thread.start()
+        self.task = asyncio.get_running_loop().create_task(self._run_continuous_tests())
         self.logger.info("Continuous test runner started")
     
     def stop(self):
         self.running = False
-        if self.thread:
-            self.thread.join()
+        if self.task:
+            self.task.cancel()
+            self.task = None
         self.logger.info("Continuous test runner stopped")
     
-    def _run_continuous_tests(self):
+    async def _run_continuous_tests(self):
         while self.running:
             try:
                 self.logger.info("Running scheduled tests")
                 
-                api_results = self.test_runner.run_smoke_tests()
-                self.logger.info(f"Smoke tests completed: {api_results}")
+                api_results = await self.test_runner.run_smoke_tests_async()
+                self.logger.info("Smoke tests completed: %s", api_results)
                 
-                time.sleep(self.interval)
+                await asyncio.sleep(self.interval)
                 
             except Exception as e:
-                self.logger.error(f"Error in continuous test runner: {str(e)}")
-                time.sleep(60)
\ No newline at end of file
+                self.logger.error("Error in continuous test runner: %s", e)
+                await asyncio.sleep(60)